@@ -0,0 +1,124 @@
+"""Numba kernels for the APT token simulation.
+
+Kept out of the Streamlit script so the compiled dispatchers live in
+sys.modules and survive reruns instead of being rebuilt every time.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is unavailable; fall back to plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+MARKET_MAKER_ALLOCATION = 0.10  # 10%
+
+@njit(cache=True, fastmath=True)
+def simulate_kernel(net_revenue_usd, initial_supply, deflator_balance, circulating_supply, investor_staked_tokens,
+                    initial_price, stake_duration, competitive_yield_frac, stake_yield_factor,
+                    out_price, out_circ, out_staked, out_revenue_apt, out_burned,
+                    out_deflator, out_yield, out_stake_target, out_stake_pct, out_staker_alloc, out_cum_burned):
+    """Run the month-by-month staking/burn recurrence, writing into the out_* arrays"""
+
+    current_price = initial_price
+    inv_initial_supply = 1.0 / initial_supply
+    staked_tokens = investor_staked_tokens
+    cum_burn = 0.0
+
+    for month in range(net_revenue_usd.shape[0]):
+        # Revenue in APT tokens (buying APT with USD revenue via AMM)
+        # Use a fixed price or gradually appreciating price
+        monthly_revenue_apt = net_revenue_usd[month] / current_price
+        
+        # Staking mechanics and token burning
+        total_stakable = circulating_supply + staked_tokens
+        stake_weight = staked_tokens / total_stakable
+        staker_alloc = monthly_revenue_apt * stake_weight
+
+        supply_ratio = (circulating_supply + deflator_balance) * inv_initial_supply
+        current_price = initial_price / supply_ratio  # Price inversely related to supply
+
+        # Calculate annual yield for stakers
+        annual_yield_pct = staker_alloc * 12.0 / staked_tokens if staked_tokens > 0 else 0.0
+        # Determine target stake percentage
+        if annual_yield_pct < competitive_yield_frac:
+            target_stake_pct = 0.0
+        else:
+            target_stake_pct = min(annual_yield_pct * stake_yield_factor, 1.0)
+
+        # Token unlock schedule
+        if month >= stake_duration and investor_staked_tokens > 0:
+            investor_staked_tokens = 0.0
+
+        # Adjust voluntary staking
+        target_stake_total = target_stake_pct * total_stakable
+        staked_tokens = max(target_stake_total, investor_staked_tokens)
+
+        # Deflator matching burn
+        deflator_matching_burn = min(monthly_revenue_apt, deflator_balance)
+        deflator_balance -= deflator_matching_burn
+
+        # Burn the rest of revenue APT
+        revenue_apt_to_burn = monthly_revenue_apt - staker_alloc
+        circulating_supply = total_stakable - staked_tokens - revenue_apt_to_burn
+        tokens_burned = revenue_apt_to_burn + deflator_matching_burn
+        cum_burn += tokens_burned
+
+        # Calculate metrics
+        out_price[month] = current_price
+        out_circ[month] = circulating_supply
+        out_staked[month] = staked_tokens
+        out_revenue_apt[month] = monthly_revenue_apt
+        out_burned[month] = tokens_burned
+        out_deflator[month] = deflator_balance
+        out_yield[month] = annual_yield_pct * 100  # As percentage for display
+        out_stake_target[month] = target_stake_total
+        out_stake_pct[month] = stake_weight * 100
+        out_staker_alloc[month] = staker_alloc
+        out_cum_burned[month] = cum_burn
+
+@njit(cache=True)
+def initial_state(total_supply, investor_alloc):
+    """Opening deflator balance, circulating supply and staked investor tokens"""
+    investor_tokens = total_supply * investor_alloc
+    deflator_balance = total_supply * (0.8 - investor_alloc)  # Remaining up to 80%
+    mm_tokens = total_supply * MARKET_MAKER_ALLOCATION
+    investor_staked_tokens = investor_tokens * (2/3)  # 2/3 initially staked
+    circulating_supply = mm_tokens + (investor_tokens * (1/3))  # 1/3 initially liquid (circulating) supply
+    return deflator_balance, circulating_supply, investor_staked_tokens
+
+@njit(cache=True)
+def sweep_final_price(investor_grid, duration_grid, net_revenue_usd, total_supply, funding,
+                      competitive_yield_frac, stake_yield_factor):
+    """Final-month price for every (investor allocation, stake duration) pair"""
+    months = net_revenue_usd.shape[0]
+    out = np.empty((investor_grid.shape[0], duration_grid.shape[0]))
+
+    for i in range(investor_grid.shape[0]):
+        deflator_balance, circulating_supply, investor_staked_tokens = initial_state(total_supply, investor_grid[i])
+        initial_price = funding / (total_supply * investor_grid[i])
+
+        # Scratch outputs, reused across durations for this allocation
+        price = np.empty(months)
+        circ = np.empty(months)
+        staked = np.empty(months)
+        revenue_apt = np.empty(months)
+        burned = np.empty(months)
+        deflator = np.empty(months)
+        yield_pct = np.empty(months)
+        stake_target = np.empty(months)
+        stake_pct = np.empty(months)
+        staker_alloc = np.empty(months)
+        cum_burned = np.empty(months)
+
+        for j in range(duration_grid.shape[0]):
+            simulate_kernel(
+                net_revenue_usd, total_supply, deflator_balance, circulating_supply,
+                investor_staked_tokens, initial_price, duration_grid[j], competitive_yield_frac,
+                stake_yield_factor,
+                price, circ, staked, revenue_apt, burned,
+                deflator, yield_pct, stake_target, stake_pct, staker_alloc, cum_burned
+            )
+            out[i, j] = price[-1]
+
+    return out
@@ -1,10 +1,15 @@
+from collections import namedtuple
+
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import plotly.express as px
 
+from apt_sim import initial_state, simulate_kernel, sweep_final_price
+
 # Page configuration
 st.set_page_config(page_title="APT Token Economy Dashboard (Alliance)", layout="wide")
 
@@ -96,127 +101,177 @@ with st.sidebar.expander("Market Setup"):
 st.sidebar.markdown("*Liquid Token Stake % calculated automatically based on yield*")
 
 # Constants
-MARKET_MAKER_ALLOCATION = 0.10  # 10%
 DEV_ALLOCATION = 0.10  # 10%
 HOURS_PER_DAY = 4  # 4 hours of generation per day
 DAYS_PER_YEAR = 365
+TABLE_TAIL_MONTHS = 24  # Rows shown in the results table by default
+_INV_12 = 1.0 / 12.0  # Annual -> monthly, as a multiply
+
+# Chart line styles (shared across reruns; do not mutate)
+_LINE_PRICE = dict(color='#00CC96', width=3)
+_LINE_FDV = dict(color='#AB63FA', width=2, dash='dash')
+_LINE_CIRCULATING = dict(color='#FF6692', width=3)
+_LINE_STAKED = dict(color='#19D3F3', width=2)
+_LINE_YIELD = dict(color='#FFA15A', width=2, dash='dot')
+_LINE_DEFLATOR = dict(color='#00CC96', width=3)
+_LINE_STAKE_TARGET = dict(color='#FFA15A', width=2, dash='dot')
+_LINE_STAKE_ACTUAL = dict(width=2, dash='dot')
+_BURN_COLOR = '#FF4B4B'
+
+# Sidebar inputs that drive the simulation (cache key for calculate_token_economics)
+SimParams = namedtuple('SimParams', [
+    'investor_alloc', 'stake_duration', 'months', 'total_supply', 'deployment_months',
+    'opex_allocation', 'reinvestment_allocation', 'competitive_yield', 'stake_yield_factor'
+])
+
+# Inputs the sensitivity sweep reads; allocation and stake duration are the grid axes, so they stay out of the key
+SweepParams = namedtuple('SweepParams', [
+    'months', 'total_supply', 'deployment_months', 'opex_allocation', 'reinvestment_allocation',
+    'competitive_yield', 'stake_yield_factor', 'annual_revenue_usd', 'funding'
+])
+
+# Final-month values shown in the metrics panel
+TerminalMetrics = namedtuple('TerminalMetrics', [
+    'price', 'fdv', 'market_cap', 'circulating', 'staked', 'yield_pct', 'stake_pct',
+    'monthly_rev_usd', 'opex_usd', 'reinvest_usd', 'net_rev_usd', 'deflator'
+])
+
+def _revenue_schedule(params, annual_revenue_usd):
+    """Monthly gross and net (after OPEX/reinvestment) revenue in USD"""
+    months_arr = np.arange(params.months)
+    inv_deploy = 1.0 / params.deployment_months
+    deployment_progress = np.minimum((months_arr + 1) * inv_deploy, 1.0)  # Ramp during deployment phase
+    current_annual_revenue = annual_revenue_usd * deployment_progress
+    monthly_revenue_usd = current_annual_revenue * _INV_12
+    # Revenue left after OPEX and reinvestment, as a single multiply
+    net_factor = 1.0 - params.opex_allocation - params.reinvestment_allocation
+    return monthly_revenue_usd, monthly_revenue_usd * net_factor
+
+def _derive_constants(funding, cost_per_mw, kwh_price, investor_alloc, total_supply):
+    """Solar and pricing quantities that depend only on sidebar inputs"""
 
-def calculate_token_economics(investor_alloc, stake_duration):
-    """Calculate token economics over time"""
-    
-    # Token allocations
-    investor_tokens = TOTAL_SUPPLY * investor_alloc
-    deflator_balance = TOTAL_SUPPLY * (0.8 - investor_alloc)  # Remaining up to 80%
-    mm_tokens = TOTAL_SUPPLY * MARKET_MAKER_ALLOCATION
-    dev_locked = TOTAL_SUPPLY * DEV_ALLOCATION
-    
-    # Initial pricing
-    initial_price = FUNDING_AMOUNT / investor_tokens
-    current_price = initial_price
-    
     # Solar capacity calculation
-    solar_capacity_mw = FUNDING_AMOUNT / SOLAR_COST_PER_MW
+    solar_capacity_mw = funding / cost_per_mw
     annual_kwh = solar_capacity_mw * 1000 * HOURS_PER_DAY * DAYS_PER_YEAR  # Convert MW to kW
-    annual_revenue_usd = annual_kwh * KWH_PRICE
-    
-    results = []
+
+    # Initial pricing
+    investor_tokens = total_supply * investor_alloc
+    initial_price = funding / investor_tokens if investor_tokens > 0 else 0
+
+    return dict(
+        solar_capacity_mw=solar_capacity_mw,
+        annual_kwh=annual_kwh,
+        annual_revenue_usd=annual_kwh * kwh_price,
+        initial_price=initial_price
+    )
+
+# SimParams carries every sidebar input the simulation reads, so the cache key is complete
+@st.cache_data(max_entries=128)
+def calculate_token_economics(params, derived):
+    """Calculate token economics over time"""
+    months = params.months
     
+    initial_price = derived['initial_price']
+
+    # Revenue schedule does not depend on token state, so build it up front
+    monthly_revenue_usd, net_revenue_usd = _revenue_schedule(params, derived['annual_revenue_usd'])
+
+    # Preallocated output columns
+    price_arr = np.empty(months)
+    circulating_arr = np.empty(months)
+    staked_arr = np.empty(months)
+    revenue_apt_arr = np.empty(months)
+    burned_arr = np.empty(months)
+    deflator_arr = np.empty(months)
+    yield_arr = np.empty(months)
+    stake_target_arr = np.empty(months)
+    stake_pct_arr = np.empty(months)
+    staker_alloc_arr = np.empty(months)
+    cum_burned_arr = np.empty(months)
+
     # Initial state
-    total_supply = TOTAL_SUPPLY
-    investor_staked_tokens = investor_tokens * (2/3)  # 2/3 initially staked
-    circulating_supply = mm_tokens + (investor_tokens * (1/3))  # 1/3 initially liquid (circulating) supply
-    staked_tokens = investor_staked_tokens  # + dev_locked
-
-    for month in range(months):
-        # Deployment phase (first 10 months)
-        if month < DEPLOYMENT_MONTHS:
-            deployment_progress = (month + 1) / DEPLOYMENT_MONTHS
-            current_annual_revenue = annual_revenue_usd * deployment_progress
-        else:
-            current_annual_revenue = annual_revenue_usd
-
-        # Revenue in APT tokens (buying APT with USD revenue via AMM)
-        monthly_revenue_usd = current_annual_revenue / 12
-        # Allocate revenue to OPEX and reinvestment
-        opex_allocation_usd = monthly_revenue_usd * OPEX_ALLOCATION
-        reinvestment_allocation_usd = monthly_revenue_usd * REINVESTMENT_ALLOCATION
-        net_revenue_usd = monthly_revenue_usd - (opex_allocation_usd + reinvestment_allocation_usd)
-        # Use a fixed price or gradually appreciating price
-        monthly_revenue_apt = net_revenue_usd / current_price
-        
-        # Staking mechanics and token burning
-        total_stakable = circulating_supply + staked_tokens
-        stake_weight = staked_tokens / total_stakable
-        staker_alloc = monthly_revenue_apt * stake_weight
-
-        supply_ratio =  (circulating_supply + deflator_balance) / TOTAL_SUPPLY
-        current_price = initial_price / supply_ratio  # Price inversely related to supply
-
-        # Calculate annual yield for stakers
-        annual_yield_pct = (staker_alloc * 12) / staked_tokens if staked_tokens > 0 else 0
-        # Determine target stake percentage
-        if annual_yield_pct < (competitive_yield / 100):
-            target_stake_pct = 0
-        else:
-            target_stake_pct = min(annual_yield_pct * stake_yield_factor, 1)
-
-        # Token unlock schedule
-        if month >= stake_duration and investor_staked_tokens > 0:
-            investor_staked_tokens = 0
-
-        if month >= 36 and dev_locked > 0:
-            dev_locked = 0
-
-        # Adjust voluntary staking
-        target_stake_total = target_stake_pct * total_stakable
-        staked_tokens = max(target_stake_total, investor_staked_tokens)
-        circulating_supply = total_stakable - staked_tokens
-
-        # Deflator matching burn
-        deflator_matching_burn = min(monthly_revenue_apt, deflator_balance)
-        deflator_balance -= deflator_matching_burn
-
-        # Burn the rest of revenue APT
-        revenue_apt_to_burn = monthly_revenue_apt - staker_alloc
-        circulating_supply -= revenue_apt_to_burn
-        total_supply -= (revenue_apt_to_burn + deflator_matching_burn)
-
-        # Calculate metrics
-        fdv = current_price * total_supply
-        market_cap = current_price * circulating_supply
-
-        results.append({
-            'Month': month + 1,
-            'Price': current_price,
-            'Circulating_Supply': circulating_supply,
-            'Staked_Tokens': staked_tokens,
-            'FDV': fdv,
-            'Market_Cap': market_cap,
-            'Monthly_Revenue_USD': monthly_revenue_usd,
-            'OPEX_Allocation_USD': opex_allocation_usd,
-            'Reinvestment_Allocation_USD': reinvestment_allocation_usd,
-            'Net_Revenue_USD': net_revenue_usd,
-            'Monthly_Revenue_APT': monthly_revenue_apt,
-            'Tokens_Burned': revenue_apt_to_burn + deflator_matching_burn,
-            'Deflator_Balance': deflator_balance,
-            'Annual_Yield_Pct': annual_yield_pct * 100,  # As percentage for display
-            'Stake_Target': target_stake_total,
-            'Stake_Tokens': staked_tokens,
-            'Stake_Percentage': stake_weight * 100,
-            'Staker_Allocation': staker_alloc
-        })
-
-    return pd.DataFrame(results)
+    deflator_balance, circulating_supply, investor_staked_tokens = initial_state(
+        float(params.total_supply), params.investor_alloc
+    )
 
-# Calculate results
-df = calculate_token_economics(investor_allocation, investor_stake_duration)
+    simulate_kernel(
+        net_revenue_usd, float(params.total_supply), deflator_balance, circulating_supply,
+        investor_staked_tokens, initial_price, params.stake_duration, params.competitive_yield / 100,
+        params.stake_yield_factor,
+        price_arr, circulating_arr, staked_arr, revenue_apt_arr, burned_arr,
+        deflator_arr, yield_arr, stake_target_arr, stake_pct_arr, staker_alloc_arr, cum_burned_arr
+    )
 
-# Main dashboard
-col1, col2 = st.columns([2, 1])
+    # Valuation metrics follow from the recurrence outputs, so compute them vectorized
+    fdv_arr = price_arr * (params.total_supply - cum_burned_arr)
+    market_cap_arr = price_arr * circulating_arr
+
+    # Allocate revenue to OPEX and reinvestment (output columns only)
+    opex_allocation_usd = monthly_revenue_usd * params.opex_allocation
+    reinvestment_allocation_usd = monthly_revenue_usd * params.reinvestment_allocation
+
+    latest = TerminalMetrics(
+        price=float(price_arr[-1]),
+        fdv=float(fdv_arr[-1]),
+        market_cap=float(market_cap_arr[-1]),
+        circulating=float(circulating_arr[-1]),
+        staked=float(staked_arr[-1]),
+        yield_pct=float(yield_arr[-1]),
+        stake_pct=float(stake_pct_arr[-1]),
+        monthly_rev_usd=float(monthly_revenue_usd[-1]),
+        opex_usd=float(opex_allocation_usd[-1]),
+        reinvest_usd=float(reinvestment_allocation_usd[-1]),
+        net_rev_usd=float(net_revenue_usd[-1]),
+        deflator=float(deflator_arr[-1])
+    )
+
+    df = pd.DataFrame({
+        'Month': np.arange(1, months + 1),
+        'Price': price_arr,
+        'Circulating_Supply': circulating_arr,
+        'Staked_Tokens': staked_arr,
+        'FDV': fdv_arr,
+        'Market_Cap': market_cap_arr,
+        'Monthly_Revenue_USD': monthly_revenue_usd,
+        'OPEX_Allocation_USD': opex_allocation_usd,
+        'Reinvestment_Allocation_USD': reinvestment_allocation_usd,
+        'Net_Revenue_USD': net_revenue_usd,
+        'Monthly_Revenue_APT': revenue_apt_arr,
+        'Tokens_Burned': burned_arr,
+        'Deflator_Balance': deflator_arr,
+        'Annual_Yield_Pct': yield_arr,
+        'Stake_Target': stake_target_arr,
+        'Stake_Percentage': stake_pct_arr,
+        'Staker_Allocation': staker_alloc_arr,
+        'Cumulative_Burned': cum_burned_arr
+    })
+    return df, latest
+
+# Sensitivity grids: investor allocation (fraction) x investor stake duration (months)
+SWEEP_INVESTOR_GRID = np.linspace(0.1, 0.8, 15)
+SWEEP_DURATION_GRID = np.arange(0, 61, 6, dtype=np.float64)
+
+@st.cache_data(max_entries=32)
+def calculate_price_sensitivity(sweep):
+    """Final price across the investor allocation / stake duration grid"""
+    _, net_revenue_usd = _revenue_schedule(sweep, sweep.annual_revenue_usd)
+    return sweep_final_price(
+        SWEEP_INVESTOR_GRID, SWEEP_DURATION_GRID, net_revenue_usd, float(sweep.total_supply),
+        float(sweep.funding), sweep.competitive_yield / 100, sweep.stake_yield_factor
+    )
+
+def _to_float32(frame):
+    """Copy of frame with float64 columns downcast to float32 for the browser"""
+    float_cols = frame.select_dtypes(include='float64').columns
+    return frame.astype(dict.fromkeys(float_cols, np.float32))
+
+# chart_df columns plotted by the price/supply figure, in trace order
+PRICE_SUPPLY_COLUMNS = ('Price_r6', 'FDV_M', 'Circ_M', 'Staked_M', 'Yield_r2')
+
+@st.cache_resource
+def _price_supply_skeleton():
+    """Layout and styled empty traces for the price/supply figure (shared, never mutated)"""
 
-with col1:
-    st.subheader("📈 Price and Supply Trends")
-    
     # Create subplot with secondary y-axis
     fig = make_subplots(
         rows=2, cols=1,
@@ -227,33 +282,28 @@ with col1:
     
     # Price and valuation
     fig.add_trace(
-        go.Scatter(x=df['Month'], y=round(df['Price'], 6), name='Token Price ($)', 
-                  line=dict(color='#00CC96', width=3)),
+        go.Scattergl(name='Token Price ($)', line=_LINE_PRICE),
         row=1, col=1
     )
     
     fig.add_trace(
-        go.Scatter(x=df['Month'], y=round(df['FDV']/1e6, 2), name='FDV ($M)', 
-                  line=dict(color='#AB63FA', width=2, dash='dash')),
+        go.Scattergl(name='FDV ($M)', line=_LINE_FDV),
         row=1, col=1, secondary_y=True
     )
     
     # Supply and staking
     fig.add_trace(
-        go.Scatter(x=df['Month'], y=round(df['Circulating_Supply']/1e6, 2), name='Circulating Supply (M)', 
-                  line=dict(color='#FF6692', width=3)),
+        go.Scattergl(name='Circulating Supply (M)', line=_LINE_CIRCULATING),
         row=2, col=1
     )
     
     fig.add_trace(
-        go.Scatter(x=df['Month'], y=round(df['Staked_Tokens']/1e6, 2), name='Staked Tokens (M)', 
-                  line=dict(color='#19D3F3', width=2)),
+        go.Scattergl(name='Staked Tokens (M)', line=_LINE_STAKED),
         row=2, col=1
     )
     
     fig.add_trace(
-        go.Scatter(x=df['Month'], y=round(df['Annual_Yield_Pct'], 2), name='Annual Yield (%)', 
-                  line=dict(color='#FFA15A', width=2, dash='dot')),
+        go.Scattergl(name='Annual Yield (%)', line=_LINE_YIELD),
         row=2, col=1, secondary_y=True
     )
     
@@ -264,119 +314,247 @@ with col1:
     fig.update_yaxes(title_text="FDV ($M)", secondary_y=True, row=1, col=1)
     fig.update_yaxes(title_text="Tokens (Millions)", row=2, col=1)
     fig.update_yaxes(title_text="Annual Yield (%)", secondary_y=True, row=2, col=1)
-    
-    st.plotly_chart(fig, use_container_width=True)
 
-with col2:
-    st.subheader("📊 Current Metrics")
-    
-    # Latest values
-    latest = df.iloc[-1]
-    
-    # Key metrics
-    st.metric("Current Price", f"${latest['Price']:.3f}")
-    st.metric("FDV", f"${latest['FDV']/1e6:.1f}M")
-    st.metric("Market Cap", f"${latest['Market_Cap']/1e6:.1f}M")
-    st.metric("Circulating Supply", f"{latest['Circulating_Supply']/1e6:.1f}M")
-    st.metric("Staked Tokens", f"{latest['Staked_Tokens']/1e6:.1f}M")
-    st.metric("Annual Yield", f"{latest['Annual_Yield_Pct']:.1f}%")
-    st.metric("Stake %", f"{latest['Stake_Percentage']:.1f}%")
-    
-    st.subheader("🏭 Solar Infrastructure")
-    st.metric("Monthly Revenue", f"${latest['Monthly_Revenue_USD']:,.0f}")
-    st.metric("OPEX Allocation", f"${latest['OPEX_Allocation_USD']:,.0f}")
-    st.metric("Reinvestment Allocation", f"${latest['Reinvestment_Allocation_USD']:,.0f}")
-    st.metric("Net Revenue", f"${latest['Net_Revenue_USD']:,.0f}")
-    st.metric("Deflator Balance", f"{latest['Deflator_Balance']/1e6:.1f}M APT")
+    return fig
 
-# Additional analysis
-st.subheader("🔥 Token Burn Analysis")
+def build_price_supply_fig(chart_df):
+    """Build the price/valuation and supply/staking subplot figure"""
+    month = chart_df['Month'].to_numpy()
 
-col3, col4 = st.columns(2)
+    # Copy the cached skeleton and only fill in the data
+    fig = go.Figure(_price_supply_skeleton())
+    for trace, column in zip(fig.data, PRICE_SUPPLY_COLUMNS):
+        trace.update(x=month, y=chart_df[column].to_numpy())
 
-with col3:
-    # Cumulative burn chart
-    df['Cumulative_Burned'] = df['Tokens_Burned'].cumsum()
-    
-    fig_burn = go.Figure()
-    fig_burn.add_trace(go.Scatter(
-        x=df['Month'], y=round(df['Cumulative_Burned']/1e6, 2),
-        name='Cumulative Burned (M)',
-        fill='tonexty',
-        line=dict(color='#FF4B4B', width=2)
-    ))
-    
-    fig_burn.update_layout(
-        title="Cumulative Token Burns",
-        xaxis_title="Month",
-        yaxis_title="Tokens Burned (Millions)",
-        height=400
-    )
-    
-    st.plotly_chart(fig_burn, use_container_width=True)
+    return fig
 
-with col4:
-    fig_deflation = make_subplots(specs=[[{"secondary_y": True}]])
-    fig_deflation.add_trace(go.Scatter(
-        x=df['Month'], y=round(df['Deflator_Balance']/1000, 2),
+def _hash_frame(frame):
+    """Content hash of a DataFrame, used as the cache key for figure builders"""
+    return pd.util.hash_pandas_object(frame, index=True).values.tobytes()
+
+@st.cache_data(max_entries=128, hash_funcs={pd.DataFrame: _hash_frame})
+def _price_fig_json(chart_df):
+    """Serialized price/supply figure, so cache hits skip trace construction entirely"""
+    return build_price_supply_fig(chart_df).to_json()
+
+def build_deflation_fig(chart_df):
+    """Build the supply crunch figure (deflator balance vs. staking)"""
+    month = chart_df['Month'].to_numpy()
+
+    # Single cell with a secondary axis, so a plain Figure with yaxis2 is enough
+    fig_deflation = go.Figure(layout=dict(
+        xaxis=dict(domain=[0, 0.94]),  # Leave room for the right-hand axis
+        yaxis2=dict(overlaying='y', side='right', title='Staked (%)')
+    ))
+    fig_deflation.add_trace(go.Scattergl(
+        x=month, y=chart_df['Deflator_K'].to_numpy(),
         name='Deflator Balance (K)',
-        line=dict(color='#00CC96', width=3)
+        line=_LINE_DEFLATOR
     ))
 
     fig_deflation.add_trace(
-        go.Scatter(x=df['Month'], y=round(df['Stake_Target']/1000, 2), name='Target Percentage APT Staked (k)', 
-                  line=dict(color='#FFA15A', width=2, dash='dot')), secondary_y=True
+        go.Scattergl(x=month, y=chart_df['Stake_Target_K'].to_numpy(), name='Target Percentage APT Staked (k)', 
+                  line=_LINE_STAKE_TARGET, yaxis='y2')
     )
 
     fig_deflation.add_trace(
-        go.Scatter(x=df['Month'], y=round(df['Stake_Tokens']/1000, 2), name='Actual APT Staked (k)', 
-                  line=dict(width=2, dash='dot')), secondary_y=True
+        go.Scattergl(x=month, y=chart_df['Staked_K'].to_numpy(), name='Actual APT Staked (k)', 
+                  line=_LINE_STAKE_ACTUAL, yaxis='y2')
     )
     
     fig_deflation.update_layout(
         title="Supply Crunch",
+        xaxis_title="Month",
+        yaxis_title="Balance (K)",
         height=400, showlegend=True, hovermode='x unified'
     )
 
-    fig_deflation.update_xaxes(title_text="Month")
-    fig_deflation.update_yaxes(title_text="Balance (K)")
-    fig_deflation.update_yaxes(title_text="Staked (%)", secondary_y=True)
+    return fig_deflation
+
+@st.cache_data(max_entries=128, hash_funcs={pd.DataFrame: _hash_frame})
+def _deflation_fig_json(chart_df):
+    """Serialized supply crunch figure, cached like the price/supply one"""
+    return build_deflation_fig(chart_df).to_json()
+
+# Chart blocks run as fragments so they can rerun independently of the rest of the page
+@st.fragment
+def _render_price_supply(chart_df):
+    fig = pio.from_json(_price_fig_json(chart_df))
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def _render_burn(chart_df):
+    # Cumulative burn chart: a single filled series, so the lighter Vega-Lite
+    # renderer is used instead of Plotly to keep the payload small
+    st.markdown("**Cumulative Token Burns**")
+    st.area_chart(
+        chart_df, x='Month', y='Cum_Burn_M',
+        x_label="Month", y_label="Tokens Burned (Millions)",
+        color=_BURN_COLOR, height=400
+    )
 
+@st.fragment
+def _render_deflation(chart_df):
+    fig_deflation = pio.from_json(_deflation_fig_json(chart_df))
     st.plotly_chart(fig_deflation, use_container_width=True)
 
+# Calculate results
+derived = _derive_constants(FUNDING_AMOUNT, SOLAR_COST_PER_MW, KWH_PRICE, investor_allocation, TOTAL_SUPPLY)
+params = SimParams(
+    investor_alloc=investor_allocation,
+    stake_duration=investor_stake_duration,
+    months=months,
+    total_supply=TOTAL_SUPPLY,
+    deployment_months=DEPLOYMENT_MONTHS,
+    opex_allocation=OPEX_ALLOCATION,
+    reinvestment_allocation=REINVESTMENT_ALLOCATION,
+    competitive_yield=competitive_yield,
+    stake_yield_factor=stake_yield_factor
+)
+df, latest = calculate_token_economics(params, derived)
+
+# Rounded/scaled series for the charts, computed once per rerun on the raw ndarrays
+chart_df = pd.DataFrame({
+    'Month': df['Month'].to_numpy(),
+    'Price_r6': np.round(df['Price'].to_numpy(), 6),
+    'FDV_M': np.round(df['FDV'].to_numpy() * 1e-6, 2),
+    'Circ_M': np.round(df['Circulating_Supply'].to_numpy() * 1e-6, 2),
+    'Staked_M': np.round(df['Staked_Tokens'].to_numpy() * 1e-6, 2),
+    'Yield_r2': np.round(df['Annual_Yield_Pct'].to_numpy(), 2),
+    'Cum_Burn_M': np.round(df['Cumulative_Burned'].to_numpy() * 1e-6, 2),
+    'Deflator_K': np.round(df['Deflator_Balance'].to_numpy() * 1e-3, 2),
+    'Stake_Target_K': np.round(df['Stake_Target'].to_numpy() * 1e-3, 2),
+    'Staked_K': np.round(df['Staked_Tokens'].to_numpy() * 1e-3, 2)
+})
+chart_df = _to_float32(chart_df)  # Halves the chart payload; values are already rounded for display
+
+# Main dashboard
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    st.subheader("📈 Price and Supply Trends")
+    
+    _render_price_supply(chart_df)
+
+with col2:
+    st.subheader("📊 Current Metrics")
+    
+    # Key metrics, rendered as one table element instead of one message per st.metric
+    token_metrics = pd.DataFrame({
+        'Metric': ["Current Price", "FDV", "Market Cap", "Circulating Supply", "Staked Tokens",
+                   "Annual Yield", "Stake %"],
+        'Value': [
+            f"${latest.price:.3f}",
+            f"${latest.fdv/1e6:.1f}M",
+            f"${latest.market_cap/1e6:.1f}M",
+            f"{latest.circulating/1e6:.1f}M",
+            f"{latest.staked/1e6:.1f}M",
+            f"{latest.yield_pct:.1f}%",
+            f"{latest.stake_pct:.1f}%"
+        ]
+    })
+    st.table(token_metrics.set_index('Metric'))
+    
+    st.subheader("🏭 Solar Infrastructure")
+    solar_metrics = pd.DataFrame({
+        'Metric': ["Monthly Revenue", "OPEX Allocation", "Reinvestment Allocation", "Net Revenue",
+                   "Deflator Balance"],
+        'Value': [
+            f"${latest.monthly_rev_usd:,.0f}",
+            f"${latest.opex_usd:,.0f}",
+            f"${latest.reinvest_usd:,.0f}",
+            f"${latest.net_rev_usd:,.0f}",
+            f"{latest.deflator/1e6:.1f}M APT"
+        ]
+    })
+    st.table(solar_metrics.set_index('Metric'))
+
+# Additional analysis
+st.subheader("🔥 Token Burn Analysis")
+
+col3, col4 = st.columns(2)
+
+with col3:
+    _render_burn(chart_df)
+
+with col4:
+    _render_deflation(chart_df)
+
 # Summary statistics
 st.subheader("📋 Simulation Summary")
 
 summary_col1, summary_col2, summary_col3 = st.columns(3)
 
+# Column totals straight from the underlying NumPy arrays
+revenue_usd_arr = df['Monthly_Revenue_USD'].to_numpy()
+opex_usd_arr = df['OPEX_Allocation_USD'].to_numpy()
+reinvestment_usd_arr = df['Reinvestment_Allocation_USD'].to_numpy()
+cum_burned_arr = df['Cumulative_Burned'].to_numpy()
+
+initial_price_calc = derived['initial_price']
+price_app = ((latest.price / initial_price_calc) - 1) * 100 if initial_price_calc > 0 else 0
+
+# One markdown block per column; dollar signs are escaped so they are not read as LaTeX
 with summary_col1:
-    st.markdown("**Token Allocation:**")
-    st.write(f"• Investors: {investor_allocation*100:.0f}% ({investor_allocation*TOTAL_SUPPLY/1e6:.1f}M)")
-    st.write(f"• Deflator: {(0.8-investor_allocation)*100:.0f}% ({(0.8-investor_allocation)*TOTAL_SUPPLY/1e6:.1f}M)")
-    st.write(f"• Market Maker: 10% (10.0M)")
-    st.write(f"• Dev Team: 10% (10.0M)")
+    st.markdown(
+        "**Token Allocation:**\n\n"
+        f"• Investors: {investor_allocation*100:.0f}% ({investor_allocation*TOTAL_SUPPLY/1e6:.1f}M)\n\n"
+        f"• Deflator: {(0.8-investor_allocation)*100:.0f}% ({(0.8-investor_allocation)*TOTAL_SUPPLY/1e6:.1f}M)\n\n"
+        "• Market Maker: 10% (10.0M)\n\n"
+        "• Dev Team: 10% (10.0M)"
+    )
 
 with summary_col2:
-    st.markdown("**Financial Metrics:**")
-    initial_price_calc = FUNDING_AMOUNT / (investor_allocation * TOTAL_SUPPLY) if investor_allocation > 0 else 0
-    st.write(f"• Initial Price: ${initial_price_calc:.3f}")
-    st.write(f"• Final Price: ${latest['Price']:.3f}")
-    price_app = ((latest['Price'] / initial_price_calc) - 1) * 100 if initial_price_calc > 0 else 0
-    st.write(f"• Price Appreciation: {price_app:.1f}%")
-    st.write(f"• Total Revenue (4Y): ${df['Monthly_Revenue_USD'].sum():,.0f}")
-    st.write(f"• Total OPEX (4Y): ${df['OPEX_Allocation_USD'].sum():,.0f}")
-    st.write(f"• Total Reinvestment (4Y): ${df['Reinvestment_Allocation_USD'].sum():,.0f}")
+    st.markdown(
+        "**Financial Metrics:**\n\n"
+        f"• Initial Price: \\${initial_price_calc:.3f}\n\n"
+        f"• Final Price: \\${latest.price:.3f}\n\n"
+        f"• Price Appreciation: {price_app:.1f}%\n\n"
+        f"• Total Revenue (4Y): \\${float(revenue_usd_arr.sum()):,.0f}\n\n"
+        f"• Total OPEX (4Y): \\${float(opex_usd_arr.sum()):,.0f}\n\n"
+        f"• Total Reinvestment (4Y): \\${float(reinvestment_usd_arr.sum()):,.0f}"
+    )
 
 with summary_col3:
-    st.markdown("**Solar Infrastructure:**")
-    solar_capacity = FUNDING_AMOUNT / SOLAR_COST_PER_MW
-    annual_kwh = solar_capacity * 1000 * HOURS_PER_DAY * DAYS_PER_YEAR
-    st.write(f"• Capacity: {solar_capacity:.1f} MW")
-    st.write(f"• Annual Generation: {annual_kwh/1e6:.1f} GWh")
-    st.write(f"• Annual Revenue: ${annual_kwh * KWH_PRICE/1e6:.1f}M")
-    st.write(f"• Total Burned: {df['Cumulative_Burned'].iloc[-1]/1e6:.1f}M APT")
-
-st.dataframe(df, use_container_width=True) # Displays an interactive table filling the container width
+    st.markdown(
+        "**Solar Infrastructure:**\n\n"
+        f"• Capacity: {derived['solar_capacity_mw']:.1f} MW\n\n"
+        f"• Annual Generation: {derived['annual_kwh']/1e6:.1f} GWh\n\n"
+        f"• Annual Revenue: \\${derived['annual_revenue_usd']/1e6:.1f}M\n\n"
+        f"• Total Burned: {float(cum_burned_arr[-1])/1e6:.1f}M APT"
+    )
+
+# Parameter sweep is opt-in; it runs the simulation once per grid cell
+with st.expander("🧪 Sensitivity Analysis"):
+    if st.toggle("Run parameter sweep", value=False):
+        sweep = SweepParams(
+            months=months,
+            total_supply=TOTAL_SUPPLY,
+            deployment_months=DEPLOYMENT_MONTHS,
+            opex_allocation=OPEX_ALLOCATION,
+            reinvestment_allocation=REINVESTMENT_ALLOCATION,
+            competitive_yield=competitive_yield,
+            stake_yield_factor=stake_yield_factor,
+            annual_revenue_usd=derived['annual_revenue_usd'],
+            funding=FUNDING_AMOUNT
+        )
+        final_price_grid = calculate_price_sensitivity(sweep)
+        sensitivity_fig = px.imshow(
+            final_price_grid,
+            x=SWEEP_DURATION_GRID,
+            y=np.round(SWEEP_INVESTOR_GRID * 100, 1),
+            labels=dict(x="Investor Stake Duration (months)", y="Investor Allocation (%)", color="Final Price ($)"),
+            origin='lower',
+            aspect='auto',
+            color_continuous_scale='Viridis'
+        )
+        sensitivity_fig.update_layout(title="Final Price Sensitivity", height=450)
+        st.plotly_chart(sensitivity_fig, use_container_width=True)
+
+# Only ship the most recent months to the browser unless the full table is requested
+show_full_table = st.toggle("Show all months", value=False)
+table_df = df if show_full_table else df.tail(TABLE_TAIL_MONTHS)
+st.dataframe(table_df, use_container_width=True) # Displays an interactive table filling the container width
 
 # Footer
 st.markdown("---")